@@ -34,14 +34,56 @@ class Settings(BaseSettings):
     # --- Indexing & Data Source ---
     DATA_PATH: Path = BASE_DIR / "data" / "content.jsonl"
     DB_PATH: Path = BASE_DIR / "vector_db"
+    # Optional location of a .tar.gz archive of the vector database (`s3://bucket/key`
+    # or an https:// URL). If DB_PATH does not exist at startup, it is downloaded from here.
+    DB_ARCHIVE_URL: Optional[str] = None
     EMBEDDING_MODEL_NAME: str = 'intfloat/multilingual-e5-large'
+    # Device for the embedding model ('cuda', 'mps' or 'cpu').
+    # If not set, the best available device is detected automatically.
+    EMBEDDING_DEVICE: Optional[str] = None
+    EMBEDDING_BATCH_SIZE: int = 32
+    # Number of CPU threads each process uses for embedding inference. If not
+    # set, PyTorch / ONNX Runtime use all cores. `python -m src.main` splits the
+    # cores between its workers when this is not set.
+    EMBEDDING_NUM_THREADS: Optional[int] = None
+    # Directory with the int8-quantized ONNX export of the embedding model,
+    # created by `scripts/export_embedding_model.py`. Used for CPU inference if present.
+    EMBEDDING_ONNX_DIR: Path = BASE_DIR / "models" / "embedding-onnx-int8"
+    # Directory with a local safetensors snapshot of the embedding model, created by
+    # `scripts/export_embedding_model.py --format safetensors`. Loaded instead of
+    # EMBEDDING_MODEL_NAME if present, which avoids Hub lookups and memory-maps the weights.
+    EMBEDDING_LOCAL_DIR: Path = BASE_DIR / "models" / "embedding-safetensors"
+    # Number of query embeddings kept in memory to skip re-embedding repeated questions.
+    QUERY_EMBEDDING_CACHE_SIZE: int = 4096
+    # Concurrent queries are embedded together: a batch is flushed once it has
+    # QUERY_BATCH_SIZE queries or QUERY_BATCH_WAIT_MS after its first query arrived.
+    QUERY_BATCH_SIZE: int = 32
+    QUERY_BATCH_WAIT_MS: float = 10.0
 
     # --- Text Splitting Parameters ---
     CHUNK_SIZE: int = 1500
     CHUNK_OVERLAP: int = 200
 
+    # --- Answer Cache ---
+    # Identical questions (ignoring case and whitespace) are answered from
+    # an in-memory cache for ANSWER_CACHE_TTL seconds.
+    ANSWER_CACHE_MAXSIZE: int = 1024
+    ANSWER_CACHE_TTL: int = 3600
+
     # --- LLM & API Configuration ---
     OPENAI_API_KEY: Optional[str] = None
+    # Shared secret for admin endpoints such as `/cache/clear`, sent in the
+    # `X-Admin-Key` header. If not set, the admin endpoints are disabled.
+    ADMIN_API_KEY: Optional[str] = None
+
+    # --- API Server (used by `python -m src.main`) ---
+    API_HOST: str = "127.0.0.1"
+    API_PORT: int = 8000
+    # Number of Uvicorn worker processes; defaults to the number of CPU cores,
+    # or to 1 when the embedding model runs on a GPU. Each worker loads its own
+    # copy of the embedding model and keeps its own answer cache, so lower this
+    # value on machines with limited memory.
+    API_WORKERS: Optional[int] = None
 
     @field_validator("OPENAI_API_KEY")
     @classmethod
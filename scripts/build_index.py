@@ -4,11 +4,12 @@ Standalone script for building or updating the ChromaDB vector database.
 
 This script reads documents from a specified .jsonl file, processes them into
 chunks, generates vector embeddings using a sentence-transformer model, and
-ingests them into a persistent ChromaDB store.
+ingests them into a persistent ChromaDB store. The stored vectors are then
+exported into the in-process HNSW index that the API serves queries from.
 
-It supports incremental updates (resumability) by checking for existing documents
-and provides command-line arguments for flexible execution, including processing
-subsets of data for testing.
+It supports incremental updates (resumability) by skipping documents whose
+`content_hash` is already indexed, and provides command-line arguments for
+flexible execution, including processing subsets of data for testing.
 
 Usage:
     - For a full build using default settings:
@@ -19,6 +20,9 @@ Usage:
 
     - To process a specific batch of documents:
       $ python scripts/build_index.py --start 1000 --stop 2000
+
+    - To only export the HNSW index from an existing database (e.g. one built in Colab):
+      $ python scripts/build_index.py --export-only
 """
 
 import argparse
@@ -26,7 +30,7 @@ import hashlib
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 # Ensure the 'src' directory is in the Python path to allow for absolute imports.
 project_root = Path(__file__).parent.parent.resolve()
@@ -34,40 +38,111 @@ sys.path.append(str(project_root))
 
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+import numpy as np
 from tqdm import tqdm
 
 from config import settings
-from src.data_processing.loader import load_and_prepare_documents
+from src.core.dependencies import create_document_embedding_model
+from src.core.vector_index import INDEX_DIRNAME, HNSWVectorStore
+from src.data_processing.loader import batched, iter_documents
 
 # Configure logging to provide informative output during the script's execution.
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Number of source documents read from the .jsonl file and split at a time.
+DOCUMENT_BATCH_SIZE = 512
+# Number of stored chunks read back from Chroma at a time when exporting.
+EXPORT_PAGE_SIZE = 5000
+# Marker file in the database directory, present while Chroma holds changes
+# that have not been exported to the HNSW index yet.
+EXPORT_PENDING_FILENAME = ".hnsw-export-pending"
+
 
-def create_chunk_id(chunk: Document, chunk_index: int) -> str:
+def create_document_key(document: Document) -> str:
     """
-    Creates a unique and deterministic ID for a document chunk.
+    Creates a deterministic key identifying one version of a source document.
 
-    The ID is generated by creating an SHA-256 hash of the source URL,
-    the chunk's content, and its index. This ensures that even identical
-    chunks from different documents or positions have unique identifiers.
+    The key is an SHA-256 hash of the source URL and the document's
+    `content_hash`, so it changes whenever the page content changes. If the
+    source data has no content hash, the hash of the prepared content is used.
+    The embedding model and the chunking parameters are part of the key as
+    well, so changing any of them re-indexes every document.
 
     Args:
-        chunk (Document): The document chunk to ID.
-        chunk_index (int): The sequential index of the chunk.
+        document (Document): The source document.
 
     Returns:
-        str: A unique hexadecimal ID for the chunk.
+        str: A hexadecimal key for the document version.
     """
-    unique_string = f"{chunk.metadata.get('source', '')}{chunk.page_content}{chunk_index}"
+    content_hash = (
+        document.metadata.get('content_hash')
+        or hashlib.sha256(document.page_content.encode()).hexdigest()
+    )
+    unique_string = "\n".join([
+        document.metadata.get('source', ''),
+        content_hash,
+        settings.EMBEDDING_MODEL_NAME,
+        str(settings.CHUNK_SIZE),
+        str(settings.CHUNK_OVERLAP),
+    ])
     return hashlib.sha256(unique_string.encode()).hexdigest()
 
 
+def create_chunk_id(document_key: str, chunk_index: int) -> str:
+    """
+    Creates a unique and deterministic ID for a document chunk.
+
+    Args:
+        document_key (str): The key of the document the chunk belongs to.
+        chunk_index (int): The index of the chunk within its document.
+
+    Returns:
+        str: A unique ID for the chunk.
+    """
+    return f"{document_key}-{chunk_index}"
+
+
+def find_stale_chunk_ids(db: Chroma, documents: List[Tuple[str, Document]]) -> List[str]:
+    """
+    Finds stored chunks of the given URLs that belong to other document versions.
+
+    Args:
+        db (Chroma): The vector store.
+        documents (List[Tuple[str, Document]]): The current (key, document) pairs,
+                                                one per URL.
+
+    Returns:
+        List[str]: The IDs of the outdated chunks.
+    """
+    current_keys = {key for key, _ in documents}
+    sources = [doc.metadata['source'] for _, doc in documents if doc.metadata['source']]
+    if not sources:
+        return []
+    stored_ids = db.get(where={"source": {"$in": sources}}, include=[])['ids']
+    # Chunk IDs are "<document key>-<index>"; IDs from older schemes have no
+    # matching key and are outdated as well.
+    return [
+        chunk_id for chunk_id in stored_ids
+        if chunk_id.rsplit('-', 1)[0] not in current_keys
+    ]
+
+
 def run_indexing(db_path: Path, start: int = 0, stop: Optional[int] = None):
     """
     The main function to build and populate the vector database.
 
+    Documents are streamed from the source file in fixed-size batches, so
+    memory usage stays bounded by the batch size regardless of corpus size.
+    Documents whose content is already indexed (same URL and `content_hash`)
+    are skipped before splitting and embedding, so a rebuild only pays the
+    embedding cost for new or changed pages. Chunks of a previous version of
+    a changed page are removed once the new version is stored, so an
+    interrupted run never loses a page.
+
+    The HNSW index is re-exported whenever Chroma was modified, including by
+    an earlier run that was interrupted before or during its export.
+
     Args:
         db_path (Path): The file path to the directory for the ChromaDB instance.
         start (int): The starting line index to process from the input file.
@@ -75,55 +150,141 @@ def run_indexing(db_path: Path, start: int = 0, stop: Optional[int] = None):
     """
     logging.info(f"🚀 Starting indexing process. Database will be stored at: '{db_path}'")
 
-    # Step 1: Load and prepare documents within the specified range
-    documents = load_and_prepare_documents(settings.DATA_PATH, start=start, stop=stop)
-    if not documents:
-        logging.warning("No documents found in the specified range. Exiting.")
-        return
+    # Step 1: Initialize the embedding model and the vector database client.
+    # Documents are always embedded at full precision (FP16 on a GPU, FP32 on
+    # the CPU), never with the int8 query model.
+    embedding_model = create_document_embedding_model()
+    db = Chroma(
+        persist_directory=str(db_path),
+        embedding_function=embedding_model
+    )
+    export_marker = db_path / EXPORT_PENDING_FILENAME
 
-    # Step 2: Split documents into chunks and assign unique IDs
+    # Step 2: Stream documents in batches. For each batch, look up which
+    # documents are already indexed, then split the remaining ones into
+    # chunks with stable IDs, upsert them, and remove outdated chunks.
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=settings.CHUNK_SIZE,
         chunk_overlap=settings.CHUNK_OVERLAP
     )
-    chunks = text_splitter.split_documents(documents)
-    for i, chunk in enumerate(chunks):
-        chunk.metadata["id"] = create_chunk_id(chunk, i)
-    logging.info(f"✅ Prepared {len(chunks)} chunks for processing.")
-
-    # Step 3: Initialize the embedding model and the vector database client
-    embedding_model = HuggingFaceEmbeddings(
-        model_name=settings.EMBEDDING_MODEL_NAME,
-        model_kwargs={'device': 'cpu'},  # Explicitly use CPU for local indexing
-        encode_kwargs={'normalize_embeddings': True}
-    )
-    db = Chroma(
-        persist_directory=str(db_path),
-        embedding_function=embedding_model
-    )
+    documents = iter_documents(settings.DATA_PATH, start=start, stop=stop)
+    total_documents = 0
+    total_skipped = 0
+    total_indexed = 0
+    total_removed = 0
 
-    # Step 4: Filter out chunks that are already present in the database
-    logging.info("🔍 Checking for already indexed chunks...")
-    existing_ids = set(db.get(include=[])['ids'])
-    logging.info(f"✅ Found {len(existing_ids)} existing chunks in the database.")
-    chunks_to_index = [chunk for chunk in chunks if chunk.metadata["id"] not in existing_ids]
+    for doc_batch in tqdm(batched(documents, DOCUMENT_BATCH_SIZE), desc="Indexing Batches"):
+        total_documents += len(doc_batch)
 
-    if not chunks_to_index:
-        logging.info("🎉 All documents are already indexed! Nothing to do.")
-        return
+        # Keep one version per URL (the last one in the batch) and drop exact
+        # duplicates, so a single upsert never receives the same ID twice.
+        latest = {}
+        for doc in doc_batch:
+            key = create_document_key(doc)
+            latest[doc.metadata['source'] or key] = (key, doc)
+        batch_documents = list(latest.values())
+
+        # A document is indexed once its first chunk exists: that chunk is
+        # always written last (see below), so its presence means the whole
+        # document was stored.
+        first_chunk_ids = [create_chunk_id(key, 0) for key, _ in batch_documents]
+        existing_ids = set(db.get(ids=first_chunk_ids, include=[])['ids'])
+        new_documents = [
+            (key, doc) for (key, doc), first_id in zip(batch_documents, first_chunk_ids)
+            if first_id not in existing_ids
+        ]
+        total_skipped += len(doc_batch) - len(new_documents)
+
+        chunks = []
+        for key, doc in new_documents:
+            doc_chunks = text_splitter.split_documents([doc])
+            for i, chunk in enumerate(doc_chunks):
+                chunk.metadata["id"] = create_chunk_id(key, i)
+            # Write the first chunk after all others, so an interrupted run
+            # leaves the document unmarked and it is re-indexed next time.
+            chunks.extend(doc_chunks[1:] + doc_chunks[:1])
 
-    logging.info(f"⏳ {len(chunks_to_index)} chunks remaining to be indexed.")
+        # Mark the HNSW index as outdated before Chroma is modified. The marker
+        # is only removed by a successful export.
+        if chunks:
+            export_marker.touch()
+        for batch in batched(chunks, settings.EMBEDDING_BATCH_SIZE):
+            batch_ids = [chunk.metadata["id"] for chunk in batch]
+            db.add_documents(documents=batch, ids=batch_ids)
+        total_indexed += len(chunks)
 
-    # Step 5: Index new chunks in batches
-    batch_size = 32  # Smaller batch size is generally better for CPU processing
-    for i in tqdm(range(0, len(chunks_to_index), batch_size), desc="Indexing Batches (CPU)"):
-        batch = chunks_to_index[i:i + batch_size]
-        batch_ids = [chunk.metadata["id"] for chunk in batch]
-        db.add_documents(documents=batch, ids=batch_ids)
+        # Only now that the current versions are stored, remove chunks of
+        # older versions of these URLs. This also runs for skipped documents,
+        # finishing any cleanup that an interrupted run did not get to.
+        stale_ids = find_stale_chunk_ids(db, batch_documents)
+        if stale_ids:
+            export_marker.touch()
+            db.delete(ids=stale_ids)
+        total_removed += len(stale_ids)
+
+    if not total_documents:
+        logging.warning("No documents found in the specified range. Exiting.")
+        return
+
+    logging.info(
+        f"✅ Skipped {total_skipped} unchanged documents; "
+        f"removed {total_removed} outdated chunks."
+    )
+    index_path = db_path / INDEX_DIRNAME
+    if not export_marker.exists() and index_path.exists():
+        logging.info("🎉 All documents are already indexed! Nothing to do.")
+        return
 
     # Note: .persist() is no longer needed with langchain-chroma's new API.
     # Saving is handled automatically when a persist_directory is provided.
-    logging.info(f"🎉 Indexing process completed successfully! Database saved in '{db_path}'.")
+    logging.info(
+        f"✅ {total_indexed} new chunks from {total_documents - total_skipped} "
+        f"documents saved in '{db_path}'."
+    )
+
+    # Step 3: Export all stored vectors into the HNSW index used by the API
+    export_hnsw_index(db, index_path)
+    logging.info("🎉 Indexing process completed successfully!")
+
+
+def export_hnsw_index(db: Chroma, index_path: Path):
+    """
+    Exports every chunk stored in Chroma into an in-process HNSW index.
+
+    The stored embeddings are reused, so nothing is re-embedded. After a
+    successful export, the export-pending marker next to the index is removed.
+
+    Args:
+        db (Chroma): The populated Chroma vector store.
+        index_path (Path): The directory to write the HNSW index to.
+    """
+    logging.info("⏳ Exporting vectors to the HNSW index...")
+    vectors = []
+    documents = []
+    offset = 0
+    while True:
+        page = db.get(
+            limit=EXPORT_PAGE_SIZE,
+            offset=offset,
+            include=["embeddings", "documents", "metadatas"]
+        )
+        if not page['ids']:
+            break
+        vectors.append(np.asarray(page['embeddings'], dtype=np.float32))
+        documents.extend(
+            Document(id=chunk_id, page_content=content, metadata=metadata or {})
+            for chunk_id, content, metadata in zip(page['ids'], page['documents'], page['metadatas'])
+        )
+        offset += len(page['ids'])
+
+    if not documents:
+        logging.warning("The database is empty; no HNSW index was written.")
+        return
+
+    store = HNSWVectorStore.from_vectors(np.vstack(vectors), documents, embedding=db.embeddings)
+    store.save(index_path)
+    (index_path.parent / EXPORT_PENDING_FILENAME).unlink(missing_ok=True)
+    logging.info(f"✅ Exported {len(documents)} vectors to '{index_path}'.")
 
 
 def setup_arg_parser() -> argparse.ArgumentParser:
@@ -154,10 +315,20 @@ def setup_arg_parser() -> argparse.ArgumentParser:
         default=None,
         help="The ending line (exclusive) in the .jsonl file to process."
     )
+    parser.add_argument(
+        '--export-only',
+        action='store_true',
+        help="Skip indexing and only export the HNSW index from the existing database."
+    )
     return parser
 
 
 if __name__ == '__main__':
     arg_parser = setup_arg_parser()
     args = arg_parser.parse_args()
-    run_indexing(db_path=Path(args.db_path), start=args.start, stop=args.stop)
+    if args.export_only:
+        # Only the stored vectors are read, so no embedding model is loaded.
+        chroma_db = Chroma(persist_directory=args.db_path)
+        export_hnsw_index(chroma_db, Path(args.db_path) / INDEX_DIRNAME)
+    else:
+        run_indexing(db_path=Path(args.db_path), start=args.start, stop=args.stop)
@@ -3,12 +3,25 @@
 API Endpoints for the RAG (Retrieval-Augmented Generation) service.
 
 This module defines the FastAPI routes that expose the functionality of the
-AkademikAI application to external clients.
+AkademikAI application to external clients. Request bodies are decoded and
+responses are encoded with msgspec (see `src.api.models`).
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import secrets
+from typing import Optional
 
-from src.api.models import AskRequest, AskResponse
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Request, Security
+from fastapi.security import APIKeyHeader
+
+from src.api.models import (
+    AskRequest,
+    AskResponse,
+    CacheClearResponse,
+    MsgspecResponse,
+    json_content,
+)
+from config import settings
 from src.core.dependencies import get_rag_pipeline
 from src.core.rag_pipeline import RAGPipeline
 
@@ -16,10 +29,35 @@ from src.core.rag_pipeline import RAGPipeline
 # This router will be included in the main FastAPI application.
 router = APIRouter()
 
+# Admin endpoints are authenticated with a shared secret sent in this header.
+admin_key_header = APIKeyHeader(name="X-Admin-Key", auto_error=False)
+
+
+def require_admin_key(api_key: Optional[str] = Security(admin_key_header)) -> None:
+    """
+    Checks the admin key of a request to an admin endpoint.
+
+    Args:
+        api_key (Optional[str]): The value of the `X-Admin-Key` header, if sent.
+
+    Raises:
+        HTTPException: 403 if no `ADMIN_API_KEY` is configured, or 401 if the
+                       header is missing or does not match it.
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled.")
+    # A constant-time comparison does not leak how much of the key matched.
+    if api_key is None or not secrets.compare_digest(
+        api_key.encode(), settings.ADMIN_API_KEY.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid or missing admin key.")
+
 
 @router.post(
     "/ask",
-    response_model=AskResponse,
+    response_class=MsgspecResponse,
+    responses={200: json_content(AskResponse)},
+    openapi_extra={"requestBody": {"required": True, **json_content(AskRequest)}},
     tags=["RAG"],
     summary="Ask a question about the university",
     description=(
@@ -27,31 +65,38 @@ router = APIRouter()
         "and returns a generated answer along with the source documents used."
     )
 )
-def ask(
-    request: AskRequest,
+async def ask(
+    request: Request,
     pipeline: RAGPipeline = Depends(get_rag_pipeline)
-) -> AskResponse:
+) -> MsgspecResponse:
     """
     Handles a user's question by performing the following steps:
-    1.  Receives the question via a POST request.
+    1.  Receives the question via a POST request and validates it with msgspec.
     2.  Uses FastAPI's dependency injection to get a ready-to-use RAGPipeline instance.
-    3.  Calls the pipeline's `answer` method to get a result.
+    3.  Awaits the pipeline's `aanswer` method to get a result.
     4.  Handles potential errors during processing.
     5.  Returns a structured `AskResponse` containing the answer and sources.
 
     Args:
-        request (AskRequest): The incoming request body with the user's question.
+        request (Request): The incoming request, whose body is an `AskRequest`.
         pipeline (RAGPipeline): The dependency-injected RAG pipeline instance.
 
     Returns:
-        AskResponse: The structured response containing the answer and source URLs.
+        MsgspecResponse: The encoded `AskResponse` with the answer and source URLs.
     """
     try:
-        result = pipeline.answer(
-            question=request.question,
-            language=request.language
+        ask_request = msgspec.json.decode(await request.body(), type=AskRequest)
+    except msgspec.DecodeError as e:
+        # ValidationError is a subclass of DecodeError, so this covers both
+        # malformed JSON and values that violate the model's constraints.
+        raise HTTPException(status_code=422, detail=f"Invalid request body: {e}")
+
+    try:
+        result = await pipeline.aanswer(
+            question=ask_request.question,
+            language=ask_request.language
         )
-        return AskResponse(**result)
+        return MsgspecResponse(msgspec.convert(result, type=AskResponse))
     except Exception as e:
         # Basic error handling for any unexpected issues in the pipeline.
         # This prevents the server from crashing and provides a clear error message.
@@ -61,3 +106,39 @@ def ask(
             status_code=500,
             detail=f"An internal error occurred while processing the request: {e}"
         )
+
+
+@router.post(
+    "/cache/clear",
+    response_class=MsgspecResponse,
+    responses={200: json_content(CacheClearResponse)},
+    dependencies=[Depends(require_admin_key)],
+    tags=["Admin"],
+    summary="Clear the answer cache",
+    description=(
+        "Removes all cached answers, so that subsequent questions are answered "
+        "from the current knowledge base. Use it after rebuilding the vector database. "
+        "Requires the `X-Admin-Key` header to match the `ADMIN_API_KEY` setting. "
+        "Each server worker keeps its own cache, and only the cache of the worker "
+        "handling this request is cleared; restart the server to clear all workers."
+    )
+)
+async def clear_cache(
+    pipeline: RAGPipeline = Depends(get_rag_pipeline)
+) -> MsgspecResponse:
+    """
+    Clears the RAG pipeline's answer cache.
+
+    The cache lives in the memory of each worker process. When the server
+    runs with several workers (`API_WORKERS`), only the worker that handles
+    this request is cleared, and the others keep serving cached answers until
+    they expire after `ANSWER_CACHE_TTL` seconds.
+
+    Args:
+        pipeline (RAGPipeline): The dependency-injected RAG pipeline instance.
+
+    Returns:
+        MsgspecResponse: The encoded `CacheClearResponse` with the number of
+                         cache entries removed from this worker.
+    """
+    return MsgspecResponse(CacheClearResponse(cleared=pipeline.clear_cache()))
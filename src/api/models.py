@@ -1,60 +1,116 @@
 # src/api/models.py
 """
-Pydantic Data Models for API Request and Response Schemas.
+msgspec Data Models for API Request and Response Schemas.
 
 This module defines the data structures used for validating incoming API
-requests and for serializing outgoing API responses. Using Pydantic models ensures
-data integrity and provides automatic, clear error messages for invalid inputs.
-These models also power the automatic generation of OpenAPI (Swagger) documentation.
+requests and for serializing outgoing API responses. The models are
+`msgspec.Struct` types, whose validation and JSON encoding are implemented in
+C and are considerably faster than Pydantic models on the request hot path.
+Constraints declared with `msgspec.Meta` are enforced while decoding, and
+invalid inputs produce clear error messages.
+
+Since FastAPI cannot introspect msgspec types, this module also exports their
+JSON schemas, which `src.main` merges into the OpenAPI (Swagger) documentation.
 """
 
-from typing import List, Literal
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Dict, List, Literal
+
+import msgspec
+from fastapi.responses import JSONResponse
 
+# Template for references to the schemas registered in the OpenAPI document.
+REF_TEMPLATE = "#/components/schemas/{name}"
 
-class AskRequest(BaseModel):
+
+class AskRequest(msgspec.Struct):
     """
     Represents the schema for an incoming question to the `/ask` endpoint.
     """
-    question: str = Field(
-        ...,
+    question: Annotated[str, msgspec.Meta(
         min_length=3,
         max_length=500,
         description="The user's question about the university.",
         examples=["What are the admission deadlines for the computer science program?"]
-    )
-    language: Literal["Polish", "English"] = Field(
-        "Polish",  # Default value
+    )]
+    language: Annotated[Literal["Polish", "English"], msgspec.Meta(
         description="The language for the generated answer."
-    )
+    )] = "Polish"  # Default value
 
 
-class Source(BaseModel):
+class Source(msgspec.Struct):
     """
     Represents a single source document used to generate an answer.
     """
-    url: str = Field(
-        ...,
+    url: Annotated[str, msgspec.Meta(
         description="The full URL of the source page.",
         examples=["https://example-university.com/admissions/deadlines"]
-    )
-    title: str = Field(
-        ...,
+    )]
+    title: Annotated[str, msgspec.Meta(
         description="The title of the source page.",
         examples=["Admission Deadlines - Example University"]
-    )
+    )]
 
 
-class AskResponse(BaseModel):
+class AskResponse(msgspec.Struct):
     """
     Represents the structured response sent back by the `/ask` endpoint.
     """
-    answer: str = Field(
-        ...,
+    answer: Annotated[str, msgspec.Meta(
         description="The generated answer to the user's question.",
         examples=["The admission deadline is July 15th."]
-    )
-    sources: List[Source] = Field(
-        ...,
+    )]
+    sources: Annotated[List[Source], msgspec.Meta(
         description="A list of source documents that were used to formulate the answer."
+    )]
+
+
+class CacheClearResponse(msgspec.Struct):
+    """
+    Represents the response sent back by the `/cache/clear` endpoint.
+    """
+    cleared: Annotated[int, msgspec.Meta(
+        description=(
+            "The number of cached answers removed from the worker that handled the request."
+        ),
+        examples=[42]
+    )]
+
+
+class MsgspecResponse(JSONResponse):
+    """
+    A JSON response that serializes its content with msgspec's C encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content)
+
+
+def openapi_schemas() -> Dict[str, Any]:
+    """
+    Generates the JSON schemas of all API models for the OpenAPI document.
+
+    Returns:
+        Dict[str, Any]: A mapping of model names to their JSON schemas.
+    """
+    _, components = msgspec.json.schema_components(
+        [AskRequest, AskResponse, CacheClearResponse],
+        ref_template=REF_TEMPLATE
     )
+    return components
+
+
+def json_content(model: type) -> Dict[str, Any]:
+    """
+    Builds an OpenAPI `content` object that references a model's schema.
+
+    Args:
+        model (type): The msgspec model.
+
+    Returns:
+        Dict[str, Any]: The content object for a request body or response.
+    """
+    return {
+        "content": {
+            "application/json": {"schema": {"$ref": REF_TEMPLATE.format(name=model.__name__)}}
+        }
+    }
@@ -0,0 +1,158 @@
+# src/core/bootstrap.py
+"""
+Vector Database Bootstrapping for Container and Serverless Deployments.
+
+In ephemeral environments the vector database is not baked into the image.
+Instead, it is stored in object storage as a gzip-compressed tar archive
+(created with `scripts/package_vector_db.py`) and fetched on startup. The
+archive is decompressed while it is being downloaded, without buffering the
+whole file in memory or on disk first.
+
+Supported archive locations:
+    - `s3://bucket/key` (requires `boto3`)
+    - `https://` URLs, e.g. pre-signed object storage links
+
+Plain `http://` is rejected: the archive contains the whole database the
+server loads, so it must not be replaceable by anyone on the network path.
+When several worker processes start at once, a file lock ensures that only
+one of them downloads the archive.
+"""
+
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import urllib.request
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+from urllib.parse import urlparse
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Timeout, in seconds, for connecting and for each read from the network,
+# so that a stalled download fails instead of blocking startup forever.
+DOWNLOAD_TIMEOUT = 60
+
+
+def _open_archive_stream(url: str) -> BinaryIO:
+    """
+    Opens a streaming, file-like reader for the archive at `url`.
+
+    Args:
+        url (str): The `s3://` or `https://` location of the archive.
+
+    Returns:
+        BinaryIO: A readable stream of the archive's bytes.
+
+    Raises:
+        ImportError: If an `s3://` URL is given but boto3 is not installed.
+        ValueError: If the URL scheme is not supported.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "s3":
+        try:
+            import boto3
+        except ImportError:
+            raise ImportError(
+                "Downloading the vector database from S3 requires boto3: `pip install boto3`"
+            ) from None
+        from botocore.config import Config
+
+        client = boto3.client(
+            "s3",
+            config=Config(connect_timeout=DOWNLOAD_TIMEOUT, read_timeout=DOWNLOAD_TIMEOUT)
+        )
+        response = client.get_object(Bucket=parsed.netloc, Key=parsed.path.lstrip("/"))
+        return response["Body"]
+    if parsed.scheme == "https":
+        return urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT)
+    raise ValueError(
+        f"Unsupported vector database archive URL: '{url}'. Use an s3:// or https:// URL."
+    )
+
+
+@contextmanager
+def _exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Holds an exclusive inter-process lock on `lock_path` while the block runs.
+
+    On platforms without `fcntl` (Windows) no lock is taken; concurrent
+    downloads are then still safe, only wasteful.
+
+    Args:
+        lock_path (Path): The lock file. It is created if it does not exist.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        # Blocks until the process holding the lock releases it.
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def download_and_extract(url: str, target: Path) -> None:
+    """
+    Streams a .tar.gz archive from `url` and extracts it into `target`.
+
+    The archive is extracted into a temporary sibling directory that is then
+    renamed to `target`, so an interrupted download never leaves a partial
+    database behind. If `target` was created by another process in the
+    meantime, that copy is kept and this one is discarded.
+
+    Args:
+        url (str): The location of the archive.
+        target (Path): The directory to create with the archive's contents.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging_dir = Path(tempfile.mkdtemp(prefix=f".{target.name}-", dir=target.parent))
+    try:
+        # Mode "r|gz" reads the archive as a forward-only stream, so it can be
+        # decompressed straight from the network response.
+        with closing(_open_archive_stream(url)) as stream, \
+                tarfile.open(fileobj=stream, mode="r|gz") as archive:
+            if hasattr(tarfile, "data_filter"):
+                # Rejects absolute paths, links outside the target, and device files.
+                archive.extractall(staging_dir, filter="data")
+            else:
+                archive.extractall(staging_dir)
+        try:
+            staging_dir.rename(target)
+        except OSError:
+            if not target.exists():
+                raise
+            logger.info(f"'{target}' was created by another process; discarding this copy.")
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def bootstrap_vector_store() -> None:
+    """
+    Downloads the vector database if it is missing and an archive URL is configured.
+
+    Does nothing when `settings.DB_PATH` already exists or `settings.DB_ARCHIVE_URL`
+    is not set, so local development setups are unaffected. Processes that
+    call this concurrently wait for the first one to finish its download
+    instead of downloading the archive themselves.
+    """
+    if settings.DB_PATH.exists() or not settings.DB_ARCHIVE_URL:
+        return
+
+    settings.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = settings.DB_PATH.with_name(f".{settings.DB_PATH.name}.lock")
+    with _exclusive_lock(lock_path):
+        # Another process may have finished the download while this one waited.
+        if settings.DB_PATH.exists():
+            return
+        logger.info(f"Downloading vector database from '{settings.DB_ARCHIVE_URL}'...")
+        download_and_extract(settings.DB_ARCHIVE_URL, settings.DB_PATH)
+        logger.info(f"Vector database extracted to '{settings.DB_PATH}'.")
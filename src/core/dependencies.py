@@ -14,51 +14,162 @@ costly re-initializations.
 import logging
 from functools import lru_cache
 
+import torch
 from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_openai import ChatOpenAI
+from langchain_core.embeddings import Embeddings
 from langchain_core.language_models import BaseChatModel
 from langchain_core.vectorstores import VectorStore
 
 from config import settings
+from src.core.bootstrap import bootstrap_vector_store
+from src.core.embeddings import CachedQueryEmbeddings, QueryBatcher
 from src.core.rag_pipeline import RAGPipeline
+from src.core.vector_index import INDEX_DIRNAME, HNSWVectorStore
 
 # It's a good practice to have a logger in this module to report
 # on the initialization of these heavy components.
 logger = logging.getLogger(__name__)
 
+# File name of the int8 ONNX graph inside `settings.EMBEDDING_ONNX_DIR`,
+# as written by `scripts/export_embedding_model.py`.
+QUANTIZED_ONNX_FILE = "onnx/model_qint8.onnx"
 
-@lru_cache(maxsize=1)
-def get_embedding_model() -> HuggingFaceEmbeddings:
+
+def resolve_device() -> str:
     """
-    Creates and returns a singleton instance of the embedding model.
-    The model is loaded into memory only on the first call to this function.
+    Picks the device for the embedding model.
+
+    An explicitly configured `EMBEDDING_DEVICE` always wins; otherwise CUDA is
+    preferred, then Apple's MPS, with the CPU as the fallback.
+
+    Returns:
+        str: The torch device name ('cuda', 'mps' or 'cpu').
+    """
+    if settings.EMBEDDING_DEVICE:
+        return settings.EMBEDDING_DEVICE
+    if torch.cuda.is_available():
+        return 'cuda'
+    if torch.backends.mps.is_available():
+        return 'mps'
+    return 'cpu'
+
+
+def create_document_embedding_model() -> HuggingFaceEmbeddings:
+    """
+    Creates the full-precision embedding model used to embed documents.
+
+    The model runs on the GPU in FP16 when one is available and in FP32 on
+    the CPU. The int8 ONNX export is never used here: its quantization error
+    is acceptable for queries, but the stored document vectors should be
+    computed at full precision. Weights are read from the local safetensors
+    snapshot when one exists.
 
     Returns:
-        HuggingFaceEmbeddings: The initialized sentence-transformer embedding model.
+        HuggingFaceEmbeddings: The initialized sentence-transformer model.
     """
-    logger.info(f"Loading embedding model '{settings.EMBEDDING_MODEL_NAME}'...")
+    device = resolve_device()
+    torch_dtype = torch.float16 if device != 'cpu' else torch.float32
+    if device == 'cpu' and settings.EMBEDDING_NUM_THREADS:
+        torch.set_num_threads(settings.EMBEDDING_NUM_THREADS)
+    # Prefer the local safetensors snapshot: its weights are memory-mapped
+    # rather than unpickled, and no Hugging Face Hub requests are made.
+    local_snapshot = settings.EMBEDDING_LOCAL_DIR
+    if (local_snapshot / "modules.json").exists():
+        model_name = str(local_snapshot)
+    else:
+        model_name = settings.EMBEDDING_MODEL_NAME
+    logger.info(f"Loading embedding model '{model_name}' on '{device}' ({torch_dtype})...")
     model = HuggingFaceEmbeddings(
-        model_name=settings.EMBEDDING_MODEL_NAME,
-        model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
+        model_name=model_name,
+        model_kwargs={
+            'device': device,
+            'model_kwargs': {'torch_dtype': torch_dtype},
+        },
+        encode_kwargs={
+            'normalize_embeddings': True,
+            'batch_size': settings.EMBEDDING_BATCH_SIZE,
+        }
     )
     logger.info("Embedding model loaded successfully.")
     return model
 
 
+@lru_cache(maxsize=1)
+def get_embedding_model() -> Embeddings:
+    """
+    Creates and returns a singleton instance of the query embedding model.
+    The model is loaded into memory only on the first call to this function.
+    It is wrapped in `CachedQueryEmbeddings`, so repeated queries are embedded once
+    and concurrent async queries are embedded together in micro-batches.
+
+    On the CPU the int8-quantized ONNX export is used if it has been created;
+    otherwise this is the model from `create_document_embedding_model`.
+    Indexing scripts should use that factory directly.
+
+    Returns:
+        Embeddings: The initialized sentence-transformer embedding model.
+    """
+    device = resolve_device()
+    quantized_model = settings.EMBEDDING_ONNX_DIR / QUANTIZED_ONNX_FILE
+
+    if device == 'cpu' and quantized_model.exists():
+        logger.info(f"Loading int8 ONNX embedding model from '{settings.EMBEDDING_ONNX_DIR}'...")
+        onnx_kwargs = {'file_name': QUANTIZED_ONNX_FILE}
+        if settings.EMBEDDING_NUM_THREADS:
+            import onnxruntime
+
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = settings.EMBEDDING_NUM_THREADS
+            onnx_kwargs['session_options'] = session_options
+        model = HuggingFaceEmbeddings(
+            model_name=str(settings.EMBEDDING_ONNX_DIR),
+            model_kwargs={
+                'device': device,
+                'backend': 'onnx',
+                'model_kwargs': onnx_kwargs,
+            },
+            encode_kwargs={
+                'normalize_embeddings': True,
+                'batch_size': settings.EMBEDDING_BATCH_SIZE,
+            }
+        )
+        logger.info("Embedding model loaded successfully.")
+    else:
+        model = create_document_embedding_model()
+    batcher = QueryBatcher(
+        model,
+        max_batch_size=settings.QUERY_BATCH_SIZE,
+        max_wait=settings.QUERY_BATCH_WAIT_MS / 1000
+    )
+    return CachedQueryEmbeddings(
+        model,
+        maxsize=settings.QUERY_EMBEDDING_CACHE_SIZE,
+        batcher=batcher
+    )
+
+
 @lru_cache(maxsize=1)
 def get_vector_store() -> VectorStore:
     """
     Creates and returns a singleton instance of the vector store client.
-    It checks for the database's existence before attempting to load it.
+    If the database is missing and `DB_ARCHIVE_URL` is configured, it is
+    downloaded first; otherwise its existence is checked before loading it.
+    Since failures are not cached, a failed download is retried on the next call.
+
+    The in-process HNSW index exported by the indexing script is preferred,
+    as it answers queries without ChromaDB's SQLite and client overhead.
+    Databases built before the export existed (or by the Colab notebook)
+    are still served through Chroma.
 
     Returns:
-        VectorStore: An instance of the Chroma vector store.
+        VectorStore: An instance of the HNSW or Chroma vector store.
 
     Raises:
         FileNotFoundError: If the vector database directory does not exist.
     """
+    bootstrap_vector_store()
     logger.info(f"Connecting to vector store at: {settings.DB_PATH}")
     if not settings.DB_PATH.exists():
         error_msg = (
@@ -69,10 +180,18 @@ def get_vector_store() -> VectorStore:
         raise FileNotFoundError(error_msg)
 
     embedding_model = get_embedding_model()
-    vector_store = Chroma(
-        persist_directory=str(settings.DB_PATH),
-        embedding_function=embedding_model
-    )
+    index_path = settings.DB_PATH / INDEX_DIRNAME
+    if index_path.exists():
+        vector_store = HNSWVectorStore.load(index_path, embedding_model)
+    else:
+        logger.warning(
+            f"No HNSW index found at '{index_path}', falling back to Chroma. "
+            "Run `python scripts/build_index.py` to export it."
+        )
+        vector_store = Chroma(
+            persist_directory=str(settings.DB_PATH),
+            embedding_function=embedding_model
+        )
     logger.info("Vector store connected successfully.")
     return vector_store
 
@@ -104,6 +223,11 @@ def get_rag_pipeline() -> RAGPipeline:
     logger.info("Assembling the RAG pipeline...")
     llm = get_llm()
     vector_store = get_vector_store()
-    pipeline = RAGPipeline(llm=llm, vector_store=vector_store)
+    pipeline = RAGPipeline(
+        llm=llm,
+        vector_store=vector_store,
+        cache_maxsize=settings.ANSWER_CACHE_MAXSIZE,
+        cache_ttl=settings.ANSWER_CACHE_TTL
+    )
     logger.info("RAG pipeline assembled successfully.")
     return pipeline
@@ -0,0 +1,187 @@
+# src/core/embeddings.py
+"""
+Embedding Model Wrappers.
+
+This module contains thin wrappers around LangChain `Embeddings` objects that
+add serving-side optimizations without changing the interface expected by
+vector stores and retrievers.
+"""
+
+import asyncio
+import threading
+from typing import List, Optional, Tuple
+
+from cachetools import LRUCache
+from langchain_core.embeddings import Embeddings
+
+
+class QueryBatcher:
+    """
+    Groups concurrently arriving queries into a single batched forward pass.
+
+    Under load, embedding each query separately runs the transformer with a
+    batch size of one, which leaves most of the CPU's SIMD lanes or the GPU
+    idle. Queries awaited through `embed` are collected for up to `max_wait`
+    seconds (or until `max_batch_size` are waiting) and embedded together with
+    one `embed_documents` call in a worker thread, so the event loop is never
+    blocked by the model.
+
+    The batcher belongs to the event loop it is first used in; its background
+    task is started lazily on the first call.
+    """
+
+    def __init__(self, embeddings: Embeddings, max_batch_size: int = 32, max_wait: float = 0.01):
+        """
+        Initializes the batcher.
+
+        Args:
+            embeddings (Embeddings): The model that embeds each batch. Its
+                                     `embed_documents` must produce the same
+                                     vectors as `embed_query` for queries.
+            max_batch_size (int): The maximum number of queries per forward pass.
+            max_wait (float): How long, in seconds, to wait for more queries
+                              after the first one of a batch arrives.
+        """
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str) -> List[float]:
+        """
+        Embeds a query as part of the next batch.
+
+        Args:
+            text (str): The query text.
+
+        Returns:
+            List[float]: The query embedding vector.
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        """Starts the background batching task if it is not running in this loop."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """Waits for the first query, then gathers more until the batch is full or time is up."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """Embeds batches of queued queries and resolves their futures, forever."""
+        while True:
+            batch = await self._collect_batch()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await asyncio.to_thread(self.embeddings.embed_documents, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            # A future may already be cancelled if its request was abandoned.
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Wraps an embedding model and memoizes the vectors of search queries.
+
+    Embedding a query means a full forward pass through the transformer, while
+    users frequently repeat or retry the same question. Query vectors are kept
+    in an LRU cache keyed on the exact query text. Document embedding, used
+    only while indexing, is passed straight through to the wrapped model.
+
+    If a `QueryBatcher` is given, cache misses on the async path are embedded
+    through it, batched with other concurrent queries.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        maxsize: int = 4096,
+        batcher: Optional[QueryBatcher] = None
+    ):
+        """
+        Initializes the wrapper.
+
+        Args:
+            embeddings (Embeddings): The underlying embedding model.
+            maxsize (int): The maximum number of query vectors kept in the cache.
+            batcher (Optional[QueryBatcher]): The batcher used by `aembed_query`.
+        """
+        self.embeddings = embeddings
+        self.batcher = batcher
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._cache_lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds a list of documents using the wrapped model, without caching.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: One embedding vector per text.
+        """
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embeds a search query, reusing the cached vector for a repeated query.
+
+        Args:
+            text (str): The query text.
+
+        Returns:
+            List[float]: The query embedding vector.
+        """
+        with self._cache_lock:
+            vector = self._cache.get(text)
+        if vector is None:
+            # Vectors are stored as tuples so callers cannot mutate the cache.
+            vector = tuple(self.embeddings.embed_query(text))
+            with self._cache_lock:
+                self._cache[text] = vector
+        return list(vector)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Asynchronously embeds a search query, batching cache misses if possible.
+
+        Args:
+            text (str): The query text.
+
+        Returns:
+            List[float]: The query embedding vector.
+        """
+        if self.batcher is None:
+            return await asyncio.to_thread(self.embed_query, text)
+        with self._cache_lock:
+            vector = self._cache.get(text)
+        if vector is None:
+            vector = tuple(await self.batcher.embed(text))
+            with self._cache_lock:
+                self._cache[text] = vector
+        return list(vector)
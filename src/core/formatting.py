@@ -0,0 +1,66 @@
+# src/core/formatting.py
+"""
+Post-Processing Helpers for Retrieved Documents.
+
+This module holds the small functions that run on every answered question:
+joining retrieved documents into the LLM context and extracting the list of
+sources. They are kept in a dependency-light, fully type-annotated module so
+that it can be compiled to a C extension with mypyc:
+
+    $ pip install mypy
+    $ mypyc src/core/formatting.py
+
+This places a `formatting.*.so` (or `.pyd`) file next to this one. Python
+imports an extension module in preference to the `.py` source of the same
+name, so the compiled version is picked up transparently. If no compiled
+module exists for the running interpreter, this file is used unchanged.
+
+Note that a compiled module keeps taking precedence after this file is
+edited: it does not pick up the changes until it is rebuilt. Delete the
+`formatting.*.so` file (or re-run mypyc) after every change here.
+"""
+
+from typing import Dict, List, Sequence
+
+from langchain_core.documents import Document
+
+# Separator placed between retrieved documents in the LLM context.
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+
+def format_context(docs: Sequence[Document]) -> str:
+    """
+    Formats a list of retrieved documents into a single string context.
+
+    Args:
+        docs (Sequence[Document]): The list of documents from the retriever.
+
+    Returns:
+        str: A formatted string containing the content of all documents.
+    """
+    return CONTEXT_SEPARATOR.join([doc.page_content for doc in docs])
+
+
+def format_sources(docs: Sequence[Document]) -> List[Dict[str, str]]:
+    """
+    Extracts unique source information from a list of documents.
+
+    Args:
+        docs (Sequence[Document]): The list of documents from the retriever.
+
+    Returns:
+        List[Dict[str, str]]: A list of unique sources, each with a URL and title.
+    """
+    # A dict keyed by URL deduplicates sources while preserving the
+    # retrieval order (dicts keep insertion order).
+    sources: Dict[str, Dict[str, str]] = {}
+    for doc in docs:
+        # Metadata values are untyped; converting them explicitly keeps the
+        # compiled module from raising TypeError on a non-str value.
+        source_url = str(doc.metadata.get("source") or "")
+        if source_url and source_url not in sources:
+            sources[source_url] = {
+                "url": source_url,
+                "title": str(doc.metadata.get("title") or "No Title")
+            }
+    return list(sources.values())
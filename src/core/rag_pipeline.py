@@ -7,16 +7,20 @@ process of answering a user's question based on a knowledge base. It uses the
 LangChain Expression Language (LCEL) to build a declarative and efficient chain.
 """
 
-from typing import List, Dict, Any
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from operator import itemgetter
 
+from cachetools import TTLCache
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import Runnable, RunnableParallel, RunnablePassthrough
+from langchain_core.runnables import Runnable, RunnableLambda, RunnableParallel
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.vectorstores import VectorStore
 
+from src.core.formatting import format_context, format_sources
+
 # This constant defines the prompt template for the RAG chain.
 # It instructs the LLM on how to behave, how to use the provided context,
 # what to do if the answer isn't found, and in which language to respond.
@@ -36,6 +40,14 @@ Question:
 {question}
 """
 
+# The languages answers can be generated in. A prompt is pre-rendered for each.
+SUPPORTED_LANGUAGES = ("Polish", "English")
+
+# The answer returned when the retriever finds no documents at all.
+NO_DOCUMENTS_ANSWER = (
+    "Unfortunately, I could not find any relevant information in my knowledge base."
+)
+
 
 class RAGPipeline:
     """
@@ -45,85 +57,179 @@ class RAGPipeline:
     relevant context from a vector store, and generating a response using an LLM.
     """
 
-    def __init__(self, llm: Runnable, vector_store: VectorStore, top_k: int = 5):
+    # The language is substituted into the template ahead of time, so each
+    # language has a fixed instruction prefix. The prompts are parsed once and
+    # shared by all instances, and the identical prefix across requests lets the
+    # LLM provider's prompt caching apply.
+    PROMPTS = {
+        language: ChatPromptTemplate.from_template(
+            RAG_PROMPT_TEMPLATE.replace("{language}", language)
+        )
+        for language in SUPPORTED_LANGUAGES
+    }
+
+    def __init__(
+        self,
+        llm: Runnable,
+        vector_store: VectorStore,
+        top_k: int = 5,
+        cache_maxsize: int = 1024,
+        cache_ttl: int = 3600
+    ):
         """
-        Initializes the RAG pipeline by constructing the LCEL chain.
+        Initializes the RAG pipeline by constructing one LCEL chain per language.
 
         Args:
             llm (Runnable): The language model to be used for generation.
             vector_store (VectorStore): The vector store for document retrieval.
             top_k (int): The number of relevant documents to retrieve.
+            cache_maxsize (int): The maximum number of answers kept in the cache.
+            cache_ttl (int): How long, in seconds, a cached answer stays valid.
         """
+        # Answers to identical questions are served from this cache, skipping
+        # retrieval and the LLM call. cachetools caches are not thread-safe,
+        # so access is guarded by a lock for the synchronous code path.
+        self._cache: TTLCache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        self._cache_lock = threading.Lock()
+
         self.llm = llm
         self.vector_store = vector_store
         self.retriever: BaseRetriever = vector_store.as_retriever(search_kwargs={"k": top_k})
-        self.prompt = ChatPromptTemplate.from_template(RAG_PROMPT_TEMPLATE)
-
-        # Define the retrieval sub-chain. It takes a dictionary as input,
-        # extracts the 'question', passes it to the retriever,
-        # and formats the resulting documents into a single context string.
-        retrieval_chain = (
-            itemgetter("question")
-            | self.retriever
-            | self._format_context
-        )
 
-        # Define the main RAG chain using LCEL.
-        # This chain expects an input dictionary: {"question": str, "language": str}
-        self.chain = (
-            RunnableParallel(
-                # The 'context' key is populated by the retrieval_chain.
-                context=retrieval_chain,
-                # 'question' and 'language' keys are passed through directly
-                # from the input dictionary.
-                question=RunnablePassthrough(),
-                language=RunnablePassthrough()
+        # Define the main RAG chains using LCEL, one per supported language.
+        # Each chain expects an input dictionary:
+        # {"docs": List[Document], "question": str}
+        # The documents are retrieved once in `answer`/`aanswer` and passed in,
+        # so the same retrieval result feeds both the prompt and the sources.
+        self._chains: Dict[str, Runnable] = {
+            language: (
+                RunnableParallel(
+                    # The 'context' key is built from the pre-fetched documents.
+                    context=itemgetter("docs") | RunnableLambda(format_context),
+                    # The 'question' key is picked directly from the input dictionary.
+                    question=itemgetter("question")
+                )
+                | prompt
+                | self.llm
+                | StrOutputParser()
             )
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
-        )
+            for language, prompt in self.PROMPTS.items()
+        }
 
     @staticmethod
-    def _format_context(docs: List[Document]) -> str:
+    def _cache_key(question: str, language: str) -> Tuple[str, str]:
+        """
+        Builds a cache key that ignores case and surrounding/repeated whitespace.
+
+        Args:
+            question (str): The user's question.
+            language (str): The language for the generated answer.
+
+        Returns:
+            Tuple[str, str]: The normalized question and the language.
         """
-        Formats a list of retrieved documents into a single string context.
+        return " ".join(question.split()).lower(), language
+
+    def _get_cached(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Returns the cached result for `key`, or None if it is missing or expired."""
+        with self._cache_lock:
+            return self._cache.get(key)
+
+    def _set_cached(self, key: Tuple[str, str], result: Dict[str, Any]) -> None:
+        """Stores a result in the answer cache."""
+        with self._cache_lock:
+            self._cache[key] = result
+
+    def _prepare(
+        self,
+        question: str,
+        language: str
+    ) -> Tuple[Runnable, Tuple[str, str], Optional[Dict[str, Any]]]:
+        """
+        Resolves the chain and the cache key for a question, and looks up the cache.
 
         Args:
-            docs (List[Document]): The list of documents from the retriever.
+            question (str): The user's question.
+            language (str): The language for the generated answer.
 
         Returns:
-            str: A formatted string containing the content of all documents.
+            Tuple[Runnable, Tuple[str, str], Optional[Dict[str, Any]]]: The chain
+                for `language`, the cache key, and the cached result (or None).
+
+        Raises:
+            ValueError: If the language is not supported.
         """
-        return "\n\n---\n\n".join(doc.page_content for doc in docs)
+        chain = self._get_chain(language)
+        cache_key = self._cache_key(question, language)
+        return chain, cache_key, self._get_cached(cache_key)
 
     @staticmethod
-    def _format_sources(docs: List[Document]) -> List[Dict[str, str]]:
+    def _no_documents_result() -> Dict[str, Any]:
+        """Returns the result for a question without any relevant documents."""
+        return {"answer": NO_DOCUMENTS_ANSWER, "sources": []}
+
+    def _finish(
+        self,
+        cache_key: Tuple[str, str],
+        generated_answer: str,
+        relevant_docs: List[Document]
+    ) -> Dict[str, Any]:
         """
-        Extracts unique source information from a list of documents.
+        Builds the result from the generated answer and its documents, and caches it.
 
         Args:
-            docs (List[Document]): The list of documents from the retriever.
+            cache_key (Tuple[str, str]): The key to store the result under.
+            generated_answer (str): The answer produced by the chain.
+            relevant_docs (List[Document]): The documents used as context.
 
         Returns:
-            List[Dict[str, str]]: A list of unique sources, each with a URL and title.
-        """
-        sources = []
-        unique_urls = set()
-        for doc in docs:
-            source_url = doc.metadata.get("source")
-            if source_url and source_url not in unique_urls:
-                sources.append({
-                    "url": source_url,
-                    "title": doc.metadata.get("title", "No Title")
-                })
-                unique_urls.add(source_url)
-        return sources
+            Dict[str, Any]: A dictionary containing the generated 'answer' and
+                            a list of 'sources'.
+        """
+        result = {"answer": generated_answer, "sources": format_sources(relevant_docs)}
+        self._set_cached(cache_key, result)
+        return result
+
+    def _get_chain(self, language: str) -> Runnable:
+        """
+        Returns the generation chain for a language.
+
+        Args:
+            language (str): The language for the generated answer.
+
+        Returns:
+            Runnable: The chain whose prompt is rendered for `language`.
+
+        Raises:
+            ValueError: If the language is not supported.
+        """
+        try:
+            return self._chains[language]
+        except KeyError:
+            raise ValueError(
+                f"Unsupported language '{language}'. "
+                f"Supported languages: {', '.join(SUPPORTED_LANGUAGES)}."
+            ) from None
+
+    def clear_cache(self) -> int:
+        """
+        Removes all cached answers, e.g. after the knowledge base was rebuilt.
+
+        Returns:
+            int: The number of entries that were removed.
+        """
+        with self._cache_lock:
+            cleared = len(self._cache)
+            self._cache.clear()
+        return cleared
 
     def answer(self, question: str, language: str = "Polish") -> Dict[str, Any]:
         """
         Executes the full RAG process for a given question in a specified language.
 
+        Results are cached, so repeating a question within the cache TTL
+        returns the previous answer without calling the retriever or the LLM.
+
         Args:
             question (str): The user's question.
             language (str): The language for the generated answer (e.g., "Polish", "English").
@@ -131,27 +237,56 @@ class RAGPipeline:
         Returns:
             Dict[str, Any]: A dictionary containing the generated 'answer' and
                             a list of 'sources'.
+
+        Raises:
+            ValueError: If the language is not supported.
         """
-        # Step 1: Retrieve documents first. This is done separately from the main
-        # chain so we can access the full document metadata for creating sources.
+        chain, cache_key, cached_result = self._prepare(question, language)
+        if cached_result is not None:
+            return cached_result
+
+        # Step 1: Retrieve documents once. They are used both as the LLM context
+        # and for building the list of sources, so retrieval is never repeated.
         relevant_docs = self.retriever.invoke(question)
 
         # Handle the edge case where no relevant documents are found.
         if not relevant_docs:
-            return {
-                "answer": "Unfortunately, I could not find any relevant information "
-                          "in my knowledge base.",
-                "sources": []
-            }
+            return self._no_documents_result()
+
+        # Step 2: Invoke the language's chain to get the final, formatted answer.
+        # The chain handles context formatting, prompting, and LLM generation.
+        generated_answer = chain.invoke({"docs": relevant_docs, "question": question})
 
-        # Step 2: Prepare the input dictionary for the main chain.
-        input_data = {"question": question, "language": language}
+        # Step 3: Format the sources from the retrieved documents and cache the result.
+        return self._finish(cache_key, generated_answer, relevant_docs)
 
-        # Step 3: Invoke the main chain to get the final, formatted answer.
-        # The chain handles context retrieval, prompting, and LLM generation.
-        generated_answer = self.chain.invoke(input_data)
+    async def aanswer(self, question: str, language: str = "Polish") -> Dict[str, Any]:
+        """
+        Asynchronous counterpart of `answer`, used by the API endpoints.
 
-        # Step 4: Format the sources from the retrieved documents.
-        sources = self._format_sources(relevant_docs)
+        Awaiting the retriever and the chain lets the event loop serve other
+        requests while this one waits on vector search and the LLM API.
+        It shares the answer cache with `answer`.
+
+        Args:
+            question (str): The user's question.
+            language (str): The language for the generated answer (e.g., "Polish", "English").
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the generated 'answer' and
+                            a list of 'sources'.
+
+        Raises:
+            ValueError: If the language is not supported.
+        """
+        chain, cache_key, cached_result = self._prepare(question, language)
+        if cached_result is not None:
+            return cached_result
+
+        relevant_docs = await self.retriever.ainvoke(question)
+
+        if not relevant_docs:
+            return self._no_documents_result()
 
-        return {"answer": generated_answer, "sources": sources}
+        generated_answer = await chain.ainvoke({"docs": relevant_docs, "question": question})
+        return self._finish(cache_key, generated_answer, relevant_docs)
@@ -0,0 +1,312 @@
+# src/core/vector_index.py
+"""
+In-Process HNSW Vector Index.
+
+This module provides a read-only LangChain `VectorStore` backed by a FAISS
+HNSW graph that lives entirely in the API process. ChromaDB remains the
+system of record used by the indexing script; after indexing, its vectors
+are exported into this compact on-disk format. At query time the search is
+a direct call into FAISS's SIMD-optimized C++ code, without SQLite or
+client/server overhead.
+
+The graph stores vectors quantized to 8 bits per dimension, which makes the
+resident index 4x smaller than with FP32 vectors and speeds up the
+memory-bound distance computations. To recover full precision, a shortlist
+of candidates is re-ranked with the original FP32 vectors, which are
+memory-mapped from disk so that only the rows actually touched are read.
+
+On disk, an index is a directory holding three files:
+    - `index.faiss`: the HNSW graph and int8-quantized vectors.
+    - `vectors.npy`: the original FP32 vectors, used for re-ranking.
+    - `documents.jsonl`: the ID, page content and metadata of each vector, by position.
+
+The documents are stored as JSON rather than pickled, so loading an index
+(which may come from a downloaded archive) never executes code.
+"""
+
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+
+import faiss
+import numpy as np
+import orjson
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Name of the index directory inside the vector database directory.
+INDEX_DIRNAME = "hnsw"
+INDEX_FILENAME = "index.faiss"
+VECTORS_FILENAME = "vectors.npy"
+DOCUMENTS_FILENAME = "documents.jsonl"
+
+# HNSW graph parameters: neighbours per node, and the candidate list sizes
+# used while building the graph and while searching it.
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+# The quantized search returns this many candidates per requested document,
+# which are then re-ranked with the exact FP32 vectors.
+RERANK_FACTOR = 4
+
+
+class HNSWVectorStore(VectorStore):
+    """
+    A read-only vector store that searches a FAISS HNSW index in process.
+
+    Vectors are expected to be L2-normalized, so the inner product used by
+    the index equals cosine similarity. Documents can only be added by
+    rebuilding the index (see `scripts/build_index.py`).
+    """
+
+    def __init__(
+        self,
+        index: faiss.Index,
+        documents: List[Document],
+        embedding: Embeddings,
+        vectors: Optional[np.ndarray] = None
+    ):
+        """
+        Initializes the store.
+
+        Args:
+            index (faiss.Index): The populated FAISS index.
+            documents (List[Document]): The documents, in the same order as the index vectors.
+            embedding (Embeddings): The model used to embed search queries.
+            vectors (Optional[np.ndarray]): The FP32 vectors for re-ranking, in the
+                                            same order. If None, no re-ranking is done.
+        """
+        if index.ntotal != len(documents):
+            raise ValueError(
+                f"Index holds {index.ntotal} vectors but {len(documents)} documents were given."
+            )
+        if vectors is not None and len(vectors) != len(documents):
+            raise ValueError(
+                f"Got {len(vectors)} re-ranking vectors for {len(documents)} documents."
+            )
+        self.index = index
+        self.documents = documents
+        self.embedding = embedding
+        self.vectors = vectors
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    @staticmethod
+    def build_index(vectors: np.ndarray) -> faiss.Index:
+        """
+        Builds an int8 scalar-quantized HNSW index over normalized vectors.
+
+        Args:
+            vectors (np.ndarray): A (n, dim) float32 matrix of embeddings.
+
+        Returns:
+            faiss.Index: The populated index.
+        """
+        index = faiss.IndexHNSWSQ(
+            vectors.shape[1], faiss.ScalarQuantizer.QT_8bit, HNSW_M, faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        # Training learns the per-dimension value ranges used for quantization.
+        index.train(vectors)
+        index.add(vectors)
+        return index
+
+    @classmethod
+    def from_vectors(
+        cls,
+        vectors: np.ndarray,
+        documents: List[Document],
+        embedding: Embeddings
+    ) -> "HNSWVectorStore":
+        """
+        Creates a store from pre-computed embeddings, e.g. exported from Chroma.
+
+        Args:
+            vectors (np.ndarray): A (n, dim) matrix of normalized embeddings.
+            documents (List[Document]): The documents matching the rows of `vectors`.
+            embedding (Embeddings): The model used to embed search queries.
+
+        Returns:
+            HNSWVectorStore: The new store.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        return cls(cls.build_index(vectors), documents, embedding, vectors=vectors)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any
+    ) -> "HNSWVectorStore":
+        """
+        Embeds the given texts and builds a store from them.
+
+        Args:
+            texts (List[str]): The texts to index.
+            embedding (Embeddings): The embedding model.
+            metadatas (Optional[List[dict]]): Optional metadata for each text.
+
+        Returns:
+            HNSWVectorStore: The new store.
+        """
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [
+            Document(page_content=text, metadata=metadata)
+            for text, metadata in zip(texts, metadatas)
+        ]
+        vectors = np.asarray(embedding.embed_documents(list(texts)), dtype=np.float32)
+        return cls.from_vectors(vectors, documents, embedding)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        raise NotImplementedError(
+            "HNSWVectorStore is read-only. Rebuild it with `python scripts/build_index.py`."
+        )
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """
+        Returns the `k` documents most similar to a query vector.
+
+        Args:
+            embedding (List[float]): The query embedding.
+            k (int): The number of documents to return.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with their cosine similarity,
+                                          most similar first.
+        """
+        query = np.asarray([embedding], dtype=np.float32)
+        shortlist_size = k * RERANK_FACTOR if self.vectors is not None else k
+        # Per-call search parameters avoid mutating the shared index across threads.
+        params = faiss.SearchParametersHNSW(efSearch=max(HNSW_EF_SEARCH, shortlist_size))
+        scores, positions = self.index.search(query, shortlist_size, params=params)
+        # FAISS pads the result with -1 when fewer vectors are available.
+        found = positions[0] != -1
+        scores, positions = scores[0][found], positions[0][found]
+
+        if self.vectors is not None:
+            # Re-rank the quantized shortlist with exact FP32 inner products.
+            scores = self.vectors[positions] @ query[0]
+            order = np.argsort(-scores)[:k]
+            scores, positions = scores[order], positions[order]
+
+        return [
+            (self.documents[position], float(score))
+            for score, position in zip(scores, positions)
+        ]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return self.similarity_search_by_vector(self.embedding.embed_query(query), k)
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        # Awaiting the embedding lets concurrent queries share a batched forward
+        # pass; the index search itself takes well under a millisecond.
+        embedding = await self.embedding.aembed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k)
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in await self.asimilarity_search_with_score(query, k)]
+
+    def save(self, path: Path) -> None:
+        """
+        Writes the index and its documents to a directory.
+
+        The files are written into a temporary sibling directory that then
+        replaces `path`, so an interrupted save never leaves a mix of old and
+        new files behind.
+
+        Args:
+            path (Path): The target directory. It is replaced if it exists.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+        try:
+            faiss.write_index(self.index, str(staging_dir / INDEX_FILENAME))
+            if self.vectors is not None:
+                np.save(staging_dir / VECTORS_FILENAME, np.asarray(self.vectors, dtype=np.float32))
+            with open(staging_dir / DOCUMENTS_FILENAME, 'wb') as f:
+                for doc in self.documents:
+                    record = {
+                        "id": doc.id,
+                        "page_content": doc.page_content,
+                        "metadata": doc.metadata,
+                    }
+                    f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+
+            # A directory cannot be renamed over a non-empty one, so the old
+            # index is moved aside first and deleted once the new one is in place.
+            old_dir = None
+            if path.exists():
+                old_dir = Path(tempfile.mkdtemp(prefix=f".{path.name}-old-", dir=path.parent))
+                path.rename(old_dir / path.name)
+            staging_dir.rename(path)
+            if old_dir is not None:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: Path, embedding: Embeddings) -> "HNSWVectorStore":
+        """
+        Loads an index previously written with `save`.
+
+        Args:
+            path (Path): The index directory.
+            embedding (Embeddings): The model used to embed search queries.
+
+        Returns:
+            HNSWVectorStore: The loaded store.
+        """
+        index = faiss.read_index(str(path / INDEX_FILENAME))
+        # Memory-map the FP32 vectors: only the re-ranked rows are paged in.
+        vectors_file = path / VECTORS_FILENAME
+        vectors = np.load(vectors_file, mmap_mode='r') if vectors_file.exists() else None
+        with open(path / DOCUMENTS_FILENAME, 'rb') as f:
+            documents = [
+                Document(
+                    id=record["id"],
+                    page_content=record["page_content"],
+                    metadata=record["metadata"]
+                )
+                for record in map(orjson.loads, f)
+            ]
+        logger.info(f"Loaded HNSW index with {index.ntotal} vectors from '{path}'.")
+        return cls(index, documents, embedding, vectors=vectors)
@@ -6,30 +6,204 @@ This module provides functions for loading raw data from source files
 and transforming it into a standardized format suitable for the RAG pipeline.
 """
 
-import json
+import io
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, TypeVar
 from itertools import islice
 
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pajson
 from langchain_core.documents import Document
 
 # Initialize a logger for this module to provide feedback on its operations.
 logger = logging.getLogger(__name__)
 
+# Number of .jsonl lines parsed together by the Arrow JSON reader.
+ARROW_BLOCK_LINES = 1024
+# Arrow's internal block size; a single JSON line must fit into one block.
+ARROW_BLOCK_SIZE = 8 << 20
+# The fields read from each line, all parsed as strings. An explicit schema
+# stops Arrow from inferring types, e.g. turning a title like "2024-10-01"
+# into a timestamp. Any other fields in the source data are ignored.
+ARROW_SCHEMA = pa.schema([
+    ("url", pa.string()),
+    ("title", pa.string()),
+    ("h1", pa.string()),
+    ("text", pa.string()),
+    ("content_hash", pa.string()),
+])
 
-def load_and_prepare_documents(
+
+T = TypeVar("T")
+
+
+def batched(iterable: Iterable[T], n: int) -> Iterator[List[T]]:
+    """
+    Splits an iterable into consecutive lists of at most `n` items.
+
+    Only one batch is held in memory at a time, which makes it suitable for
+    feeding a lazily produced stream of documents to the vector store.
+
+    Args:
+        iterable (Iterable[T]): The items to split.
+        n (int): The maximum size of each batch.
+
+    Yields:
+        List[T]: The next batch of items. The last batch may be shorter.
+    """
+    if n < 1:
+        raise ValueError("Batch size must be at least 1.")
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, n)):
+        yield batch
+
+
+def _field(data: dict, name: str, default: str):
+    """
+    Returns a field of a parsed line, treating JSON null like a missing key.
+
+    This matches the Arrow path, which fills nulls with the same defaults.
+
+    Args:
+        data (dict): The parsed JSON object.
+        name (str): The field name.
+        default (str): The value used for missing or null fields.
+
+    Returns:
+        The field value, or `default`.
+    """
+    value = data.get(name)
+    return default if value is None else value
+
+
+def _document_from_line(line: bytes, line_number: int, file_path: Path) -> Optional[Document]:
+    """
+    Parses a single .jsonl line into a `Document`, one line at a time.
+
+    This is the fallback for blocks the vectorized Arrow reader rejects, so
+    that one bad line only skips itself rather than its whole block.
+
+    Args:
+        line (bytes): The raw line.
+        line_number (int): The 1-based line number, used in warnings.
+        file_path (Path): The source file, used in warnings.
+
+    Returns:
+        Optional[Document]: The prepared document, or None if the line was skipped.
+    """
+    try:
+        data = orjson.loads(line)
+
+        # Enrich content for better context in embeddings
+        enriched_content = (
+            f"Page Title: {_field(data, 'title', 'N/A')}\n"
+            f"H1 Header: {_field(data, 'h1', 'N/A')}\n\n"
+            f"{_field(data, 'text', '')}"
+        )
+
+        metadata = {
+            "source": _field(data, 'url', ''),
+            "title": _field(data, 'title', 'No Title'),
+            "content_hash": _field(data, 'content_hash', ''),
+        }
+
+    except orjson.JSONDecodeError:
+        # Log a warning for corrupted lines but continue processing.
+        logger.warning(f"Skipping malformed JSON line {line_number} in '{file_path}'.")
+        return None
+    except (TypeError, KeyError) as e:
+        # Handle cases where the JSON is valid but missing expected keys.
+        logger.warning(
+            f"Skipping line {line_number} due to missing data in '{file_path}': {e}"
+        )
+        return None
+
+    return Document(page_content=enriched_content, metadata=metadata)
+
+
+def _string_column(table: pa.Table, name: str, default: str) -> pa.ChunkedArray:
+    """
+    Returns a string column of the table, with missing values set to `default`.
+
+    Args:
+        table (pa.Table): The parsed block.
+        name (str): The column name.
+        default (str): The value used for missing fields.
+
+    Returns:
+        pa.ChunkedArray: The column without nulls.
+    """
+    return pc.fill_null(table[name], default)
+
+
+def _documents_from_block(lines: List[bytes]) -> List[Document]:
+    """
+    Parses a block of .jsonl lines into `Document` objects in a vectorized way.
+
+    The block is parsed by Arrow's multithreaded C++ JSON reader, and the
+    enriched page content is assembled column-wise with Arrow compute
+    kernels. Python objects are only created once, for the final documents.
+
+    Args:
+        lines (List[bytes]): The raw lines of the block.
+
+    Returns:
+        List[Document]: The prepared documents, in line order.
+
+    Raises:
+        pa.ArrowException: If any line in the block cannot be parsed, or one of
+                           its fields is not a string.
+    """
+    # The last line of the file may lack a trailing newline.
+    buffer = b"".join(line if line.endswith(b"\n") else line + b"\n" for line in lines)
+    table = pajson.read_json(
+        io.BytesIO(buffer),
+        read_options=pajson.ReadOptions(block_size=ARROW_BLOCK_SIZE),
+        parse_options=pajson.ParseOptions(
+            explicit_schema=ARROW_SCHEMA,
+            unexpected_field_behavior="ignore"
+        )
+    )
+
+    # Enrich content for better context in embeddings
+    enriched_content = pc.binary_join_element_wise(
+        "Page Title: ", _string_column(table, "title", "N/A"),
+        "\nH1 Header: ", _string_column(table, "h1", "N/A"),
+        "\n\n", _string_column(table, "text", ""),
+        "",  # The last argument is the separator
+    )
+    sources = _string_column(table, "url", "").to_pylist()
+    titles = _string_column(table, "title", "No Title").to_pylist()
+    content_hashes = _string_column(table, "content_hash", "").to_pylist()
+
+    return [
+        Document(
+            page_content=content,
+            metadata={"source": source, "title": title, "content_hash": content_hash},
+        )
+        for content, source, title, content_hash
+        in zip(enriched_content.to_pylist(), sources, titles, content_hashes)
+    ]
+
+
+def iter_documents(
     file_path: Path,
     start: int = 0,
     stop: Optional[int] = None
-) -> List[Document]:
+) -> Iterator[Document]:
     """
-    Loads documents from a .jsonl file within a specified line range.
+    Lazily loads documents from a .jsonl file within a specified line range.
 
     This function reads each JSON object from a line, enriches the text content
     with title and H1 metadata for better semantic context, and converts it into
-    a LangChain `Document` object. It uses `itertools.islice` for efficient,
-    memory-friendly reading of large files.
+    a LangChain `Document` object. It uses `itertools.islice` to skip to the
+    requested range, and parses the lines in blocks with `pyarrow`'s C++ JSON
+    reader. Documents are yielded one block at a time, so peak memory does not
+    grow with the size of the file. A block containing a malformed line is
+    re-parsed line by line with `orjson`, skipping only the bad lines.
 
     Args:
         file_path (Path): The path to the .jsonl file.
@@ -37,56 +211,58 @@ def load_and_prepare_documents(
         stop (Optional[int]): The ending line number to read to (exclusive).
                               If None, reads to the end of the file. Defaults to None.
 
-    Returns:
-        List[Document]: A list of prepared `Document` objects.
+    Yields:
+        Document: The next prepared `Document` object.
     """
-    documents: List[Document] = []
     logger.info(f"Loading documents from '{file_path}' [lines {start}-{stop or 'end'}]...")
+    loaded = 0
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
             # Use islice to efficiently slice the file iterator without
             # loading the entire file into memory.
             file_iterator = islice(f, start, stop)
+            block_start = start
 
-            for i, line in enumerate(file_iterator, start=start):
+            for lines in batched(file_iterator, ARROW_BLOCK_LINES):
                 try:
-                    data = json.loads(line)
-
-                    # Enrich content for better context in embeddings
-                    enriched_content = (
-                        f"Page Title: {data.get('title', 'N/A')}\n"
-                        f"H1 Header: {data.get('h1', 'N/A')}\n\n"
-                        f"{data.get('text', '')}"
-                    )
-
-                    metadata = {
-                        "source": data.get('url', ''),
-                        "title": data.get('title', 'No Title'),
-                        "content_hash": data.get('content_hash', ''),
-                    }
-
-                    doc = Document(page_content=enriched_content, metadata=metadata)
-                    documents.append(doc)
-
-                except json.JSONDecodeError:
-                    # Log a warning for corrupted lines but continue processing.
-                    logger.warning(
-                        f"Skipping malformed JSON line {i + 1} in '{file_path}'."
-                    )
-                    continue
-                except (TypeError, KeyError) as e:
-                    # Handle cases where the JSON is valid but missing expected keys.
-                    logger.warning(
-                        f"Skipping line {i + 1} due to missing data in '{file_path}': {e}"
-                    )
-                    continue
+                    documents = _documents_from_block(lines)
+                except pa.ArrowException:
+                    documents = [
+                        doc for i, line in enumerate(lines, start=block_start)
+                        if (doc := _document_from_line(line, i + 1, file_path)) is not None
+                    ]
+                block_start += len(lines)
+
+                loaded += len(documents)
+                yield from documents
 
     except FileNotFoundError:
+        # Yield nothing rather than raising; this is safer for the indexing script.
         logger.error(f"Data file not found at path: {file_path}")
-        # Return an empty list or re-raise the exception depending on desired behavior.
-        # Returning an empty list is safer for the indexing script.
-        return []
+        return
 
-    logger.info(f"Successfully loaded and prepared {len(documents)} documents.")
-    return documents
+    logger.info(f"Successfully loaded and prepared {loaded} documents.")
+
+
+def load_and_prepare_documents(
+    file_path: Path,
+    start: int = 0,
+    stop: Optional[int] = None
+) -> List[Document]:
+    """
+    Loads documents from a .jsonl file within a specified line range.
+
+    This is a convenience wrapper around `iter_documents` for callers that
+    need the whole range as a list. Prefer `iter_documents` for large files.
+
+    Args:
+        file_path (Path): The path to the .jsonl file.
+        start (int): The starting line number to read from (inclusive). Defaults to 0.
+        stop (Optional[int]): The ending line number to read to (exclusive).
+                              If None, reads to the end of the file. Defaults to None.
+
+    Returns:
+        List[Document]: A list of prepared `Document` objects.
+    """
+    return list(iter_documents(file_path, start=start, stop=stop))
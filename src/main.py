@@ -3,10 +3,17 @@
 Main application file for the AkademikAI FastAPI service.
 
 This module initializes the FastAPI application, loads environment variables,
-sets up API metadata, and includes the API routers from other modules.
-This file serves as the entry point for the Uvicorn ASGI server.
+sets up API metadata, warms up the RAG pipeline at startup, and includes the
+API routers from other modules.
+This file serves as the entry point for the Uvicorn ASGI server, and can also
+be run directly (`python -m src.main`) to start a multi-worker production server.
 """
 
+import logging
+import os
+import sys
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 
 # Load environment variables from a .env file into the application's
@@ -17,6 +24,34 @@ load_dotenv()
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.api import endpoints
+from src.api.models import openapi_schemas
+from src.core.bootstrap import bootstrap_vector_store
+from src.core.dependencies import get_rag_pipeline
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the heavy singletons (embedding model, vector store, LLM client)
+    when the server starts, instead of on the first request. If the vector
+    database is missing and `DB_ARCHIVE_URL` is configured, the vector store
+    provider downloads it first.
+
+    A single warm-up query is also run through the retriever so that the
+    vector index is read into memory before real traffic arrives. A failure
+    is logged but does not prevent the server from starting; the dependency
+    providers do not cache failures, so loading (including the download) is
+    retried on the next request.
+    """
+    try:
+        pipeline = get_rag_pipeline()
+        pipeline.retriever.invoke("warmup")
+        logger.info("RAG pipeline warmed up.")
+    except Exception as e:
+        logger.error(f"Failed to warm up the RAG pipeline: {e}")
+    yield
 
 # --- Application Metadata ---
 # This information will be displayed in the OpenAPI (Swagger) documentation.
@@ -38,7 +73,7 @@ app_metadata = {
 }
 
 # --- FastAPI App Initialization ---
-app = FastAPI(**app_metadata)
+app = FastAPI(**app_metadata, lifespan=lifespan)
 
 # --- CORS Middleware --- #
 origins = [
@@ -63,6 +98,20 @@ app.add_middleware(
 app.include_router(endpoints.router, prefix="/api/v1")
 
 
+# --- OpenAPI Schema ---
+# The API models are msgspec Structs, which FastAPI cannot introspect. Their
+# JSON schemas are generated by msgspec and added to the OpenAPI components,
+# where the endpoints' request and response definitions reference them.
+def custom_openapi():
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(openapi_schemas())
+    return app.openapi_schema
+
+
+app.openapi = custom_openapi
+
+
 # --- Root Endpoint / Health Check ---
 @app.get("/", tags=["Health Check"], summary="Check the API's operational status.")
 async def root():
@@ -73,3 +122,47 @@ async def root():
     liveness probes in deployment environments.
     """
     return {"message": "AkademikAI API is running!"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    from config import settings
+    from src.core.dependencies import resolve_device
+
+    # Download the vector database once in this parent process, before the
+    # workers start, instead of letting every worker race for it.
+    bootstrap_vector_store()
+
+    # Each worker loads its own copy of the embedding model. On a GPU that
+    # would quickly exhaust device memory, so a single worker is the default
+    # there; on the CPU one worker per core is started.
+    cpu_count = os.cpu_count() or 1
+    if settings.API_WORKERS:
+        workers = settings.API_WORKERS
+    elif resolve_device() != 'cpu':
+        workers = 1
+    else:
+        workers = cpu_count
+
+    # PyTorch and ONNX Runtime default to one inference thread per core in
+    # every process, so N workers would run N x N threads. Unless configured
+    # explicitly, give each worker its share of the cores. The workers are
+    # spawned after this point and inherit the environment.
+    if workers > 1 and not settings.EMBEDDING_NUM_THREADS:
+        threads_per_worker = str(max(1, cpu_count // workers))
+        os.environ["EMBEDDING_NUM_THREADS"] = threads_per_worker
+        os.environ.setdefault("OMP_NUM_THREADS", threads_per_worker)
+
+    # uvloop (a libuv-based event loop) and httptools (a C HTTP parser) are
+    # installed with uvicorn[standard] and cut per-request overhead. uvloop does
+    # not support Windows, where the default asyncio loop is used instead.
+    # Each worker is a separate process with its own lru_cache'd singletons.
+    uvicorn.run(
+        "src.main:app",
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=workers,
+    )
@@ -0,0 +1,17 @@
+# tests/conftest.py
+"""
+Shared pytest configuration.
+
+Makes the project root importable, so tests can use the same absolute
+imports (`from src.core ...`) as the application and scripts. A dummy
+OpenAI key lets `config.settings` load; no test calls the OpenAI API.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -0,0 +1,211 @@
+# tests/test_build_index.py
+"""
+Tests for incremental indexing in `scripts/build_index.py`.
+
+These run the real script against a temporary Chroma database, with a fake
+embedding model that counts how many texts it embeds.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+# The script imports the full application stack.
+for module in (
+    "torch", "langchain", "langchain_chroma", "langchain_huggingface", "langchain_openai"
+):
+    pytest.importorskip(module)
+
+from langchain_chroma import Chroma  # noqa: E402
+
+from config import settings  # noqa: E402
+from src.core.vector_index import INDEX_DIRNAME, HNSWVectorStore  # noqa: E402
+
+
+class CountingEmbeddings(Embeddings):
+    """A fake model with deterministic, normalized vectors that counts embedded texts."""
+
+    def __init__(self):
+        self.embedded = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded += len(texts)
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(text.encode()[:8].ljust(8, b"\0"), "little") + len(text)
+            vector = np.random.default_rng(seed).normal(size=8)
+            vectors.append((vector / np.linalg.norm(vector)).tolist())
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def build_index(tmp_path, monkeypatch):
+    """Loads the indexing script with a fake model, small chunks and a temporary data file."""
+    spec = importlib.util.spec_from_file_location(
+        "build_index", Path(__file__).parent.parent / "scripts" / "build_index.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    model = CountingEmbeddings()
+    monkeypatch.setattr(module, "create_document_embedding_model", lambda: model)
+    monkeypatch.setattr(settings, "DATA_PATH", tmp_path / "content.jsonl")
+    monkeypatch.setattr(settings, "CHUNK_SIZE", 60)
+    monkeypatch.setattr(settings, "CHUNK_OVERLAP", 0)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_SIZE", 3)
+    module.model = model
+    return module
+
+
+def make_rows(versions=None):
+    """Five pages of several chunks each; `versions` maps a page index to a content suffix."""
+    rows = []
+    for i in range(5):
+        suffix = (versions or {}).get(i, "")
+        rows.append({
+            "url": f"https://a.edu/{i}",
+            "title": f"Page {i}",
+            "h1": "Header",
+            "text": f"word{i} " * 20 + suffix,
+            "content_hash": f"hash-{i}{suffix}",
+        })
+    return rows
+
+
+def write_rows(rows):
+    settings.DATA_PATH.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+
+
+def stored_chunks(db_path):
+    """Returns {chunk id: source URL} for everything stored in Chroma."""
+    stored = Chroma(persist_directory=str(db_path)).get(include=["metadatas"])
+    return {
+        chunk_id: metadata["source"]
+        for chunk_id, metadata in zip(stored["ids"], stored["metadatas"])
+    }
+
+
+def exported_ids(db_path):
+    store = HNSWVectorStore.load(db_path / INDEX_DIRNAME, embedding=None)
+    return {doc.id for doc in store.documents}
+
+
+def test_rerun_skips_unchanged_and_replaces_changed_documents(build_index, tmp_path):
+    db_path = tmp_path / "db"
+    write_rows(make_rows())
+    build_index.run_indexing(db_path)
+    first = stored_chunks(db_path)
+    assert build_index.model.embedded == len(first) > 5
+    assert exported_ids(db_path) == set(first)
+
+    build_index.model.embedded = 0
+    build_index.run_indexing(db_path)
+    assert build_index.model.embedded == 0
+    assert stored_chunks(db_path) == first
+
+    write_rows(make_rows({1: "changed"}))
+    build_index.run_indexing(db_path)
+    second = stored_chunks(db_path)
+    changed = {chunk_id for chunk_id, url in second.items() if url == "https://a.edu/1"}
+    # Only the changed page is re-embedded, and its old chunks are gone.
+    assert build_index.model.embedded == len(changed)
+    assert changed.isdisjoint(first)
+    assert {k: v for k, v in second.items() if k not in changed} == {
+        k: v for k, v in first.items() if v != "https://a.edu/1"
+    }
+    assert exported_ids(db_path) == set(second)
+
+
+def test_duplicates_in_one_batch_keep_the_last_version(build_index, tmp_path):
+    db_path = tmp_path / "db"
+    rows = make_rows()
+    rows.append(rows[0])
+    rows.append(dict(rows[2], text="Replacement.", content_hash="hash-2b"))
+    write_rows(rows)
+
+    build_index.run_indexing(db_path)
+
+    chunks = stored_chunks(db_path)
+    page_2 = [chunk_id for chunk_id, url in chunks.items() if url == "https://a.edu/2"]
+    assert len(page_2) == 1
+    assert set(chunks.values()) == {row["url"] for row in rows}
+
+
+def test_interrupted_upsert_keeps_old_version_and_resumes(build_index, tmp_path, monkeypatch):
+    db_path = tmp_path / "db"
+    write_rows(make_rows())
+    build_index.run_indexing(db_path)
+    before = stored_chunks(db_path)
+
+    write_rows(make_rows({3: "changed"}))
+    original_add = Chroma.add_documents
+    calls = []
+
+    def failing_add(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return original_add(self, *args, **kwargs)
+
+    monkeypatch.setattr(Chroma, "add_documents", failing_add)
+    with pytest.raises(KeyboardInterrupt):
+        build_index.run_indexing(db_path)
+    # The old version of the page is still complete.
+    assert set(before) <= set(stored_chunks(db_path))
+
+    monkeypatch.setattr(Chroma, "add_documents", original_add)
+    build_index.run_indexing(db_path)
+    after = stored_chunks(db_path)
+    page_3 = {k for k, v in after.items() if v == "https://a.edu/3"}
+    # Exactly one, new version of the page remains, and the others are untouched.
+    assert page_3.isdisjoint(before)
+    assert len({chunk_id.rsplit("-", 1)[0] for chunk_id in page_3}) == 1
+    assert {k: v for k, v in after.items() if k not in page_3} == {
+        k: v for k, v in before.items() if v != "https://a.edu/3"
+    }
+    assert exported_ids(db_path) == set(after)
+
+
+def test_interrupted_export_is_retried(build_index, tmp_path, monkeypatch):
+    db_path = tmp_path / "db"
+    write_rows(make_rows())
+    build_index.run_indexing(db_path)
+
+    write_rows(make_rows({0: "changed"}))
+
+    def failing_save(self, path):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(HNSWVectorStore, "save", failing_save)
+        with pytest.raises(KeyboardInterrupt):
+            build_index.run_indexing(db_path)
+
+    # Nothing is left to embed, but the pending export is still written.
+    build_index.run_indexing(db_path)
+    assert exported_ids(db_path) == set(stored_chunks(db_path))
+    assert not (db_path / build_index.EXPORT_PENDING_FILENAME).exists()
+
+
+def test_changing_chunk_size_reindexes_everything(build_index, tmp_path, monkeypatch):
+    db_path = tmp_path / "db"
+    write_rows(make_rows())
+    build_index.run_indexing(db_path)
+    before = stored_chunks(db_path)
+
+    monkeypatch.setattr(settings, "CHUNK_SIZE", 400)
+    build_index.model.embedded = 0
+    build_index.run_indexing(db_path)
+
+    after = stored_chunks(db_path)
+    assert build_index.model.embedded == len(after)
+    assert set(after).isdisjoint(before)
+    assert len(after) < len(before)
@@ -0,0 +1,113 @@
+# tests/test_embeddings.py
+"""Tests for the query batching and caching wrappers in `src.core.embeddings`."""
+
+import asyncio
+import threading
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.core.embeddings import CachedQueryEmbeddings, QueryBatcher
+
+
+class RecordingEmbeddings(Embeddings):
+    """A fake model that embeds a text as [len(text)] and records each batch."""
+
+    def __init__(self, fail: bool = False):
+        self.batches: List[List[str]] = []
+        self.fail = fail
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model failed")
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class BlockingEmbeddings(RecordingEmbeddings):
+    """A fake model that waits for `release` before returning a batch."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.started.set()
+        self.release.wait(timeout=5)
+        return super().embed_documents(texts)
+
+
+def test_batcher_fans_out_concurrent_queries():
+    model = RecordingEmbeddings()
+    batcher = QueryBatcher(model, max_batch_size=8, max_wait=0.05)
+    texts = ["q" * n for n in range(1, 21)]
+
+    async def run():
+        return await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    vectors = asyncio.run(run())
+
+    # Every caller gets the vector of its own text, in order.
+    assert vectors == [[float(len(text))] for text in texts]
+    assert [len(batch) for batch in model.batches] == [8, 8, 4]
+    assert [text for batch in model.batches for text in batch] == texts
+
+
+def test_batcher_propagates_errors_and_keeps_running():
+    model = RecordingEmbeddings(fail=True)
+    batcher = QueryBatcher(model, max_batch_size=4, max_wait=0.01)
+
+    async def run():
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+        )
+        model.fail = False
+        return results, await batcher.embed("abc")
+
+    results, vector = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # The worker survives a failed batch and serves the next one.
+    assert vector == [3.0]
+
+
+def test_batcher_skips_cancelled_callers():
+    model = BlockingEmbeddings()
+    batcher = QueryBatcher(model, max_batch_size=4, max_wait=0.01)
+
+    async def run():
+        cancelled = asyncio.create_task(batcher.embed("a"))
+        kept = asyncio.create_task(batcher.embed("bb"))
+        # Cancel one caller while its batch is being embedded.
+        await asyncio.to_thread(model.started.wait, 5)
+        cancelled.cancel()
+        model.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await kept, await batcher.embed("ccc")
+
+    kept_vector, next_vector = asyncio.run(run())
+
+    assert kept_vector == [2.0]
+    assert next_vector == [3.0]
+
+
+def test_cached_query_embeddings_reuses_vectors():
+    model = RecordingEmbeddings()
+    embeddings = CachedQueryEmbeddings(
+        model, maxsize=2, batcher=QueryBatcher(model, max_wait=0.01)
+    )
+
+    assert embeddings.embed_query("abc") == [3.0]
+    assert asyncio.run(embeddings.aembed_query("abc")) == [3.0]
+    assert asyncio.run(embeddings.aembed_query("abcd")) == [4.0]
+    assert model.batches == [["abc"], ["abcd"]]
+
+    # Callers cannot mutate the cached vector.
+    embeddings.embed_query("abc").append(0.0)
+    assert embeddings.embed_query("abc") == [3.0]
@@ -0,0 +1,93 @@
+# tests/test_loader.py
+"""Tests for the .jsonl document loader in `src.data_processing.loader`."""
+
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from src.data_processing.loader import (
+    _document_from_line,
+    _documents_from_block,
+    batched,
+    iter_documents,
+)
+
+ROWS = [
+    {"url": "https://a.edu/1", "title": "Admissions", "h1": "Deadlines",
+     "text": "Apply by July.", "content_hash": "h1"},
+    # Missing h1 and content_hash.
+    {"url": "https://a.edu/2", "title": "Fees", "text": "Tuition is free."},
+    # Date-like strings must stay unchanged.
+    {"url": "https://a.edu/3", "title": "2024-10-01", "h1": "2024-10-01T08:00:00",
+     "text": "Open day.", "content_hash": "h3", "crawled_at": "2024-10-02"},
+    # Missing title and text; non-ASCII content.
+    {"url": "https://a.edu/4", "h1": "Zażółć gęślą jaźń", "content_hash": "h4"},
+    # Explicit nulls behave like missing fields.
+    {"url": "https://a.edu/5", "title": None, "h1": None, "text": None, "content_hash": None},
+]
+
+
+def write_lines(path: Path, lines) -> Path:
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def as_tuples(documents):
+    return [(doc.page_content, doc.metadata) for doc in documents]
+
+
+def test_arrow_and_orjson_parsers_agree():
+    lines = [json.dumps(row, ensure_ascii=False).encode() + b"\n" for row in ROWS]
+
+    from_block = _documents_from_block(lines)
+    from_lines = [_document_from_line(line, i + 1, Path("x")) for i, line in enumerate(lines)]
+
+    assert as_tuples(from_block) == as_tuples(from_lines)
+    assert from_block[2].page_content.startswith(
+        "Page Title: 2024-10-01\nH1 Header: 2024-10-01T08:00:00\n"
+    )
+    assert from_block[3].metadata == {
+        "source": "https://a.edu/4", "title": "No Title", "content_hash": "h4"
+    }
+    assert from_block[4].page_content == "Page Title: N/A\nH1 Header: N/A\n\n"
+    assert from_block[4].metadata == {
+        "source": "https://a.edu/5", "title": "No Title", "content_hash": ""
+    }
+
+
+def test_malformed_line_only_skips_itself(tmp_path, caplog):
+    lines = [json.dumps(row, ensure_ascii=False) for row in ROWS]
+    lines.insert(2, '{"url": "https://a.edu/broken", "title": ')
+    path = write_lines(tmp_path / "content.jsonl", lines)
+
+    with caplog.at_level(logging.WARNING):
+        documents = list(iter_documents(path))
+
+    assert [doc.metadata["source"] for doc in documents] == [row["url"] for row in ROWS]
+    assert "malformed JSON line 3" in caplog.text
+
+
+def test_non_string_field_falls_back_to_line_parser(tmp_path):
+    rows = [dict(ROWS[0]), dict(ROWS[1], title=2024)]
+    path = write_lines(tmp_path / "content.jsonl", [json.dumps(row) for row in rows])
+
+    documents = list(iter_documents(path))
+
+    assert len(documents) == 2
+    assert documents[1].page_content.startswith("Page Title: 2024\n")
+
+
+def test_line_range(tmp_path):
+    path = write_lines(tmp_path / "content.jsonl", [json.dumps(row) for row in ROWS])
+
+    documents = list(iter_documents(path, start=1, stop=3))
+
+    assert [doc.metadata["source"] for doc in documents] == ["https://a.edu/2", "https://a.edu/3"]
+
+
+def test_batched():
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    with pytest.raises(ValueError):
+        list(batched([], 0))
@@ -0,0 +1,97 @@
+# tests/test_vector_index.py
+"""Tests for the in-process HNSW vector store in `src.core.vector_index`."""
+
+import faiss
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src.core.vector_index import HNSWVectorStore
+
+
+def make_vectors(n: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    """Returns `n` random L2-normalized float32 vectors."""
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_documents(n: int):
+    return [
+        Document(id=f"chunk-{i}", page_content=f"text {i}", metadata={"source": f"url-{i}"})
+        for i in range(n)
+    ]
+
+
+def test_rerank_orders_by_exact_fp32_scores():
+    vectors = make_vectors(200)
+    query = make_vectors(1, seed=1)[0]
+    # Index noisy copies of the vectors, so the shortlist order differs from
+    # the exact order, as it does with quantized vectors.
+    noise = np.random.default_rng(2).normal(scale=0.05, size=vectors.shape)
+    noisy = (vectors + noise).astype(np.float32)
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(noisy)
+    exact_top = np.argsort(-(vectors @ query))[:5]
+    assert list(np.argsort(-(noisy @ query))[:5]) != list(exact_top)
+    store = HNSWVectorStore(index, make_documents(200), embedding=None, vectors=vectors)
+
+    results = store.similarity_search_with_score_by_vector(query.tolist(), k=5)
+
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    for doc, score in results:
+        position = int(doc.id.split("-")[1])
+        assert np.isclose(score, vectors[position] @ query, atol=1e-5)
+    # With a shortlist of 20, the exact top-5 is recovered despite the noise.
+    assert [doc.id for doc, _ in results] == [f"chunk-{i}" for i in exact_top]
+
+
+def test_search_handles_fewer_vectors_than_requested():
+    vectors = make_vectors(3)
+    documents = make_documents(3)
+
+    for store in (
+        HNSWVectorStore.from_vectors(vectors, documents, embedding=None),
+        HNSWVectorStore(HNSWVectorStore.build_index(vectors), documents, embedding=None),
+    ):
+        # FAISS pads missing results with -1; they must not map to documents.
+        results = store.similarity_search_with_score_by_vector(vectors[1].tolist(), k=5)
+        assert sorted(doc.id for doc, _ in results) == ["chunk-0", "chunk-1", "chunk-2"]
+        assert results[0][0].id == "chunk-1"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    vectors = make_vectors(20)
+    documents = make_documents(20)
+    documents[0].metadata["title"] = "Zażółć gęślą jaźń"
+    HNSWVectorStore.from_vectors(vectors, documents, embedding=None).save(tmp_path)
+
+    store = HNSWVectorStore.load(tmp_path, embedding=None)
+
+    assert [doc.id for doc in store.documents] == [doc.id for doc in documents]
+    assert store.documents[0].metadata == documents[0].metadata
+    results = store.similarity_search_with_score_by_vector(vectors[7].tolist(), k=1)
+    assert results[0][0].id == "chunk-7"
+
+
+def test_interrupted_save_keeps_previous_index(tmp_path, monkeypatch):
+    index_path = tmp_path / "hnsw"
+    original = HNSWVectorStore.from_vectors(make_vectors(10), make_documents(10), embedding=None)
+    original.save(index_path)
+    replacement = HNSWVectorStore.from_vectors(
+        make_vectors(20), make_documents(20), embedding=None
+    )
+
+    def failing_save(*args, **kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(np, "save", failing_save)
+        with pytest.raises(OSError):
+            replacement.save(index_path)
+    assert len(HNSWVectorStore.load(index_path, embedding=None).documents) == 10
+
+    replacement.save(index_path)
+    assert len(HNSWVectorStore.load(index_path, embedding=None).documents) == 20
+    # No staging or backup directories are left behind.
+    assert [p.name for p in tmp_path.iterdir()] == ["hnsw"]